@@ -1,25 +1,60 @@
+import mmap
+import os
 import re
-from pathlib import Path
+import shutil
+import tempfile
 
-AKIA_RE = re.compile(r'AKIA[0-9A-Z]{16}')
+AKIA_RE = re.compile(rb'AKIA[0-9A-Z]{12}(?P<tail>[0-9A-Z]{4})')
+AKIA_REPL = rb'AKIA_REDACTED_\g<tail>'
+SUFFIXES = (".json", ".txt", ".md", ".log")
+MMAP_THRESHOLD = 1 << 20
 
-def mask_akia(s: str) -> str:
-    def repl(m):
-        v = m.group(0)
-        return f"AKIA_REDACTED_{v[-4:]}"
-    return AKIA_RE.sub(repl, s)
+def mask_akia(s: bytes) -> bytes:
+    if AKIA_RE.search(s) is None:
+        return s
+    return AKIA_RE.sub(AKIA_REPL, s)
+
+def _walk(root: str):
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                elif e.is_file(follow_symlinks=False) and e.name.lower().endswith(SUFFIXES):
+                    yield e.path
 
 def main():
-    base = Path("week2")
     changed = 0
-    for p in base.rglob("*"):
-        if p.is_file() and p.suffix.lower() in {".json", ".txt", ".md", ".log"}:
-            data = p.read_text(errors="ignore")
-            new = mask_akia(data)
-            if new != data:
-                p.write_text(new)
-                changed += 1
-                print(f"[masked] {p}")
+    for path in _walk("week2"):
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                continue
+            if size < MMAP_THRESHOLD:
+                data = f.read()
+                new = mask_akia(data)
+                if new is data:
+                    continue
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if AKIA_RE.search(mm) is None:
+                        continue
+                    new = AKIA_RE.sub(AKIA_REPL, mm[:])
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(new)
+            shutil.copymode(path, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        changed += 1
+        print(f"[masked] {path}")
     print(f"Done. Files changed: {changed}")
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+"""Shared security group scanner used by the week 2 day 8 entry points (e.g. day8-2.py)."""
+from __future__ import annotations # Allows using class names in type hints before they are fully defined
+import functools # Import library for higher-order helpers such as lru_cache
+from concurrent.futures import ThreadPoolExecutor # Import a thread pool to fan out API calls across regions
+from dataclasses import dataclass # Import the dataclass decorator to simplify class creation for storing data
+from typing import Any, FrozenSet, Iterator, List, Optional, Tuple # Import types for static type checking annotations
+
+SENSITIVE_PORTS_DEFAULT = [22, 3389, 80, 443] # Define valid ports (SSH, RDP, HTTP, HTTPS) to check for open access by default
+PAGE_SIZE = 1000 # Maximum MaxResults accepted by describe_security_groups, to minimize round trips
+
+@functools.lru_cache(maxsize=None) # Create the session once and share it across all client lookups
+def _session(): # Helper function returning the shared low-level botocore Session
+    from botocore.session import get_session # Lazy import: --help and argument errors don't pay the SDK load cost
+    return get_session() # Use botocore directly; the boto3 resource layer is not needed for EC2 describe calls
+
+@functools.lru_cache(maxsize=None) # Build the client config once and share it across regions
+def _client_config(): # Helper function returning the botocore Config used for every EC2 client
+    from botocore.config import Config # Lazy import, same reason as the session
+    return Config( # Tune the HTTP layer for back-to-back paginated and parallel calls
+        max_pool_connections=50, # Larger keep-alive pool so parallel region scans don't queue on the default of 10
+        retries={"mode": "standard", "max_attempts": 6}, # Standard retry mode with backoff for throttling errors
+        tcp_keepalive=True, # Keep idle connections alive between pages to avoid new TLS handshakes
+        user_agent_extra="sg-scan/1.0", # Tag requests so they are identifiable in CloudTrail
+    ) # Close Config constructor
+
+@functools.lru_cache(maxsize=None) # Cache one client per region so repeated scans skip client construction
+def _ec2(region: str): # Helper function returning the (cached) EC2 client for a region
+    return _session().create_client("ec2", region_name=region, config=_client_config()) # Build the EC2 client from the shared session
+
+@dataclass(frozen=True, slots=True) # Decorator to generate __init__, __repr__, etc.; slots=True drops the per-instance __dict__, frozen=True makes findings safe to share from cached_scan
+class Finding: # Define a class named 'Finding' to structure the data for each security issue found
+    region: str # Field to store the AWS region where the security group exists
+    group_id: str # Field to store the ID of the security group
+    group_name: str # Field to store the human-readable name of the security group
+    vpc_id: Optional[str] # Field to store the VPC ID (can be None if not in a VPC)
+    direction: str  # inbound # Field to store traffic direction, usually 'inbound' for ingress rules
+    protocol: str # Field to store the IP protocol (e.g., tcp, udp, or all)
+    from_port: Optional[int] # Field to store the start of the port range (can be None)
+    to_port: Optional[int] # Field to store the end of the port range (can be None)
+    cidr: str # Field to store the IP range (CIDR block) allowed by the rule
+    description: str = "" # Field for the rule's description, defaults to an empty string
+
+def _port_range_overlaps_sensitive(from_port: Optional[int], to_port: Optional[int], sensitive: FrozenSet[int]) -> bool: # Helper function to check if a rule's port range includes any sensitive ports
+ # None can happen for protocols where ports don't apply, or weird/legacy rules.
+    if from_port is None or to_port is None: # Check if either start or end port is missing (None)
+        return False # Return False because we can't determine overlap without port numbers
+    lo, hi = (from_port, to_port) if from_port <= to_port else (to_port, from_port) # Determine the lower and upper bounds of the port range
+    if hi - lo < len(sensitive): # Narrow rule: iterate the (smaller) port range and probe the set
+        return any(p in sensitive for p in range(lo, hi + 1)) # Return True if any port in [lo, hi] is sensitive
+    return any(lo <= p <= hi for p in sensitive) # Wide rule: iterate the (smaller) sensitive set instead
+
+def _normalize_proto(ip_protocol: str) -> str: # Helper function to standardize the protocol name string
+    # AWS uses "-1" for all protocols. 
+    return "all" if ip_protocol == "-1" else ip_protocol.lower() # Return "all" if input is "-1", otherwise return lowercase protocol name
+
+# Server-side filters: (filter name, world-open CIDR, permission key, CIDR key) for IPv4 and IPv6
+_WORLD_CIDRS = [ # One describe_security_groups pass per address family
+    ("ip-permission.cidr", "0.0.0.0/0", "IpRanges", "CidrIp"), # IPv4 open to the world
+    ("ip-permission.ipv6-cidr", "::/0", "Ipv6Ranges", "CidrIpv6"), # IPv6 open to the world
+] # Close filter table
+
+def _scan_cidr(ec2: Any, region: str, filter_name: str, world_cidr: str, ranges_key: str, cidr_key: str, sensitive_ports: FrozenSet[int]) -> Iterator[Finding]: # Helper to scan SGs that AWS reports as open to one world CIDR
+    # Only filter on CIDR server-side: an 'ip-permission.from-port' filter would miss wide ranges (e.g. 0-65535)
+    filters = [{"Name": filter_name, "Values": [world_cidr]}] # Ask AWS to return only SGs with a rule open to this CIDR
+    paginator = ec2.get_paginator("describe_security_groups") # Create a paginator to handle API responses that span multiple pages
+    for page in paginator.paginate(Filters=filters, PaginationConfig={"PageSize": PAGE_SIZE}): # Iterate through each page of candidate security group results
+        for sg in page.get("SecurityGroups", []): # Iterate through each security group dictionary in the current page
+            group_id = sg.get("GroupId", "") # Get the Security Group ID, defaulting to empty string if missing
+            group_name = sg.get("GroupName", "") # Get the Security Group Name, defaulting to empty string if missing
+            vpc_id = sg.get("VpcId") # Get the VPC ID associated with the group (returns None if missing)
+
+            for perm in sg.get("IpPermissions", []): # Iterate through each inbound permission (rule) in the security group
+                proto = _normalize_proto(perm["IpProtocol"]) # Get and normalize the protocol for this rule (always present)
+                from_port = perm.get("FromPort") # Get the start port number (absent for protocol -1)
+                to_port = perm.get("ToPort") # Get the end port number (absent for protocol -1)
+                if not _port_range_overlaps_sensitive(from_port, to_port, sensitive_ports): # Port check depends only on the rule, so evaluate it once per permission
+                    continue # Skip rules that don't touch sensitive ports without looking at their ranges
+
+                yield from ( # Stream one Finding per world-open range of this address family
+                    Finding( # Instantiate the Finding class (direct construction is cheaper than dataclasses.replace)
+                        region=region, # Set the region field
+                        group_id=group_id, # Set the group_id field
+                        group_name=group_name, # Set the group_name field
+                        vpc_id=vpc_id, # Set the vpc_id field
+                        direction="inbound", # Set direction to 'inbound'
+                        protocol=proto, # Set the protocol field
+                        from_port=from_port, # Set the from_port field
+                        to_port=to_port, # Set the to_port field
+                        cidr=world_cidr, # Set the cidr field
+                        description=ipr.get("Description") or "", # Set the description field, defaulting to empty string
+                    ) # Close Finding constructor
+                    for ipr in perm.get(ranges_key, []) # Iterate through the ranges of this address family defined in this rule
+                    if ipr[cidr_key] == world_cidr # Client-side check: open to world (CIDR key is always present in a range entry)
+                ) # Close generator expression
+
+def scan_security_groups(region: str, sensitive_ports: List[int]) -> Iterator[Finding]: # Generator that scans SGs in a region for rules exposing sensitive ports
+    ec2 = _ec2(region) # Get the cached low-level client for the EC2 service in the specified region
+    sensitive_set = frozenset(sensitive_ports) # Build the sensitive port set once per scan for O(1) membership checks
+    for filter_name, world_cidr, ranges_key, cidr_key in _WORLD_CIDRS: # IPv4 and IPv6 passes only look at their own ranges, so no duplicates
+        yield from _scan_cidr(ec2, region, filter_name, world_cidr, ranges_key, cidr_key, sensitive_set) # Stream this pass's findings
+
+# Opt-in only: results never refresh for the life of the process, so live scans must call scan_security_groups/scan_regions
+@functools.lru_cache(maxsize=None) # Remember each (region, ports) result so repeated scans in one process skip the API
+def cached_scan(region: str, ports: Tuple[int, ...]) -> Tuple[Finding, ...]: # Function returning a (cached) fully drained scan of one region
+    return tuple(scan_security_groups(region, list(ports))) # Materialize the generator; a tuple of frozen Findings can't be changed by callers
+
+def scan_regions(regions: List[str], sensitive_ports: List[int]) -> List[Finding]: # Function to scan several regions in parallel
+    regions = list(dict.fromkeys(regions)) # Drop repeated regions (keeping order) so no region is scanned or reported twice
+    if not regions: # Nothing to scan; also avoids ThreadPoolExecutor(max_workers=0)
+        return [] # Return an empty findings list
+    for region in regions: # Build each region's client up front, since a botocore Session is not thread-safe
+        _ec2(region) # Populate the client cache from the main thread
+    with ThreadPoolExecutor(max_workers=min(16, len(regions))) as ex: # API calls are network-bound and release the GIL
+        results = ex.map(lambda r: list(scan_security_groups(r, sensitive_ports)), regions) # Scan (and drain) every region concurrently, keeping input order; always live, never cached
+        return [f for region_findings in results for f in region_findings] # Flatten per-region findings into one list
+
+def default_region() -> Optional[str]: # Function returning the region configured in env/profile, if any
+    return _session().get_config_variable("region") # Ask the shared session for its configured region
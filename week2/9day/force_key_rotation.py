@@ -43,16 +43,47 @@ Delete old (lab-only, dangerous):
 """
 
 import argparse
+import functools
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional, List
 
-import boto3
 from botocore.exceptions import ClientError
 
+try:
+    import orjson  # optional: faster evidence serialization
+except ImportError:
+    orjson = None
+
+@functools.lru_cache(maxsize=None)
+def _session():
+    """Return the shared boto3 Session (imported lazily, so argument errors exit fast)."""
+    import boto3
+
+    return boto3.session.Session()
+
+
+@functools.lru_cache(maxsize=None)
+def _client_config():
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=50,
+        retries={"mode": "standard", "max_attempts": 6},
+        tcp_keepalive=True,
+        user_agent_extra="key-rotation/1.0",
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _client(service: str, region: str):
+    """Return a cached boto3 client for (service, region) built from the shared session."""
+    return _session().client(service, region_name=region, config=_client_config())
+
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -75,11 +106,16 @@ def redacted_tail(value: Optional[str], keep_last: int = 4) -> Optional[str]:
 
 def write_json(path: str, payload: Dict[str, Any]) -> None:
     ensure_dir(os.path.dirname(path))
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2, default=str))
+        return
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, default=str)
+        json.dump(payload, f, indent=2, default=iso)
 
 
 def iso(dt) -> str:
+    """JSON fallback encoder: datetimes as ISO 8601 (orjson does this natively)."""
     try:
         return dt.isoformat()
     except Exception:
@@ -111,7 +147,30 @@ def pick_old_key(keys: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     return sorted(keys, key=lambda k: k["CreateDate"])[0]
 
 
-def main() -> int:
+def prefetch_user_keys(iam, user_names: Optional[List[str]] = None, max_workers: int = 8) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch AccessKeyMetadata for many users at once (bulk runs).
+    get_account_authorization_details does not return access keys, so the
+    per-user ListAccessKeys calls are fanned out over a thread pool instead.
+    If user_names is None, all IAM users in the account are listed.
+    """
+    if user_names is None:
+        user_names = [
+            u["UserName"]
+            for page in iam.get_paginator("list_users").paginate()
+            for u in page.get("Users", [])
+        ]
+    if not user_names:
+        return {}
+
+    def _keys(user_name: str) -> List[Dict[str, Any]]:
+        return iam.list_access_keys(UserName=user_name).get("AccessKeyMetadata", [])
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(user_names))) as ex:
+        return dict(zip(user_names, ex.map(_keys, user_names)))
+
+
+def main(argv: Optional[List[str]] = None, prefetched_keys: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> int:
     ap = argparse.ArgumentParser(description="Rotate IAM access keys and store the new one in Secrets Manager.")
     ap.add_argument("--user-name", required=True, help="IAM user to rotate keys for (lab user).")
     ap.add_argument("--secret-id", required=True, help="Secrets Manager secret name/ARN to store new creds.")
@@ -124,11 +183,15 @@ def main() -> int:
     ap.add_argument("--delete-old", action="store_true", help="Delete the old key after storing the new one (dangerous).")
     ap.add_argument("--confirm-delete", default="", help='Required for --delete-old. Must be exactly "DELETE".')
 
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
+    # Validate before touching AWS: boto3 is only imported once clients are created below.
     if args.delete_old and args.confirm_delete != "DELETE":
         print('REFUSING: --delete-old requires --confirm-delete DELETE', file=sys.stderr)
         return 2
+    if args.max_keys < 1:
+        print("REFUSING: --max-keys must be >= 1", file=sys.stderr)
+        return 2
 
     run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     plan = RotationPlan(
@@ -145,9 +208,9 @@ def main() -> int:
     )
 
     # Create clients
-    iam = boto3.client("iam", region_name=plan.region)
-    sm = boto3.client("secretsmanager", region_name=plan.region)
-    sts = boto3.client("sts", region_name=plan.region)
+    iam = _client("iam", plan.region)
+    sm = _client("secretsmanager", plan.region)
+    sts = _client("sts", plan.region)
 
     # Evidence skeleton
     evidence: Dict[str, Any] = {
@@ -189,16 +252,19 @@ def main() -> int:
         print(json.dumps({"ok": False, "error": "STS get-caller-identity failed", "evidence": out_path}, indent=2))
         return 1
 
-    # 2) Precheck: list access keys for the user
+    # 2) Precheck: list access keys for the user (reuse prefetch_user_keys output on bulk runs)
     try:
-        resp = iam.list_access_keys(UserName=plan.user_name)
-        existing_keys = resp.get("AccessKeyMetadata", [])
+        if prefetched_keys is not None and plan.user_name in prefetched_keys:
+            existing_keys = prefetched_keys[plan.user_name]
+        else:
+            resp = iam.list_access_keys(UserName=plan.user_name)
+            existing_keys = resp.get("AccessKeyMetadata", [])
         evidence["precheck"]["existing_keys_count"] = len(existing_keys)
         evidence["precheck"]["existing_keys"] = [
             {
                 "AccessKeyId": k.get("AccessKeyId"),
                 "Status": k.get("Status"),
-                "CreateDate": iso(k.get("CreateDate")),
+                "CreateDate": k.get("CreateDate"),
             }
             for k in existing_keys
         ]
@@ -228,7 +294,7 @@ def main() -> int:
         evidence["precheck"]["secret_describe"] = {
             "Name": ds.get("Name"),
             "ARN": ds.get("ARN"),
-            "DeletedDate": iso(ds.get("DeletedDate")) if ds.get("DeletedDate") else None,
+            "DeletedDate": ds.get("DeletedDate"),
             "KmsKeyId": ds.get("KmsKeyId"),
         }
     except ClientError as e:
@@ -267,7 +333,7 @@ def main() -> int:
         evidence["actions"]["iam_create_access_key"] = {
             "new_access_key_id": new_key_id,
             "new_secret_access_key_redacted": redacted_tail(new_secret_access_key),
-            "create_date": iso(created.get("CreateDate")),
+            "create_date": created.get("CreateDate"),
             "status": created.get("Status", "Active"),
         }
     except ClientError as e: